@@ -13,7 +13,7 @@ def make_space():
 
 color_names = []
 color_names.extend(CTiles.Stylist.xlate_color_for.keys())
-color_names.extend(CTiles.Stylist.x11_color_rgb.keys())
+color_names.extend(color[0] for color in CTiles.Stylist.x11_colors)
 
 tiles = []
 
@@ -10,15 +10,25 @@ Author: Dylan Doxey
 Date: Feb 22, 2023
 See: https://github.com/ddoxey/curtiles
 """
+import os
 import re
 import sys
 import time
+import math
+import heapq
+import struct
+import selectors
 import curses
 import datetime
-from threading import Thread
-from queue import Queue, Empty as EmptyQueue
+from operator import add
+from itertools import accumulate
+from threading import Thread, Event
+from collections import deque
 from curses import wrapper, ERR as CursesErr
 
+# every character matched by r'\s' (the highest is U+3000) maps to a space
+_WS_TABLE = str.maketrans({chr(c): ' ' for c in range(0x3001) if chr(c).isspace()})
+
 class CTiles:
     """CTiles provides a configuration driven framework
        for making a "tiled" ncurses UI.
@@ -31,14 +41,37 @@ class CTiles:
         QUIT        = ord('Q')
         TOGGLE_HALT = ord(' ')
 
+    STYLE_FIELDS = frozenset(('background', 'border', 'title', 'body'))
+    TOGGLE_FIELDS = frozenset(('key', 'active'))
+    # optional tile fields and a factory for the value filled in when absent
+    TILE_DEFAULTS = (
+        ('title', lambda: None),
+        ('toggle', lambda: {'key': None, 'active': True}),
+        ('frequency', lambda: 1.0),
+        ('style', dict),
+        ('action', dict),
+        ('geometry', lambda: None),
+    )
+    TILE_FIELDS = frozenset(('title', 'toggle', 'frequency', 'style',
+                             'generator', 'geometry', 'action', '_validated'))
+
     class Grid:
         """Grid class creates a temporary representation of the terminal
            real estate and can automatically arrange the tiles from left
            to right and top to bottom.
         """
+        cell_chars = bytes.maketrans(b'\x00\x01', b'01')
+        # search results shared by every Grid, keyed on the dimensions, the
+        # slab size and the occupancy, so a re-layout of the same screen
+        # (e.g. toggling a tile off and back on) doesn't scan again
+        placements = {}
+        placements_limit = 256
+
         def __init__(self, height, width, border=False):
-            self.data = [[0 for x in range(width)] for y in range(height)]
+            # one byte per cell lets the collision tests run in C
+            self.data = [bytearray(width) for y in range(height)]
             self.has_border = border
+            self.table = None  # summed-area table, until the next reserve
             self.height = height
             self.width = width
             if self.has_border:
@@ -52,7 +85,8 @@ class CTiles:
                 b = " "
                 lines.append('|{} {} {}|'.format(b, " " * self.width, b))
             for row in self.data:
-                lines.append('|{} {} {}|'.format(b, " ".join([str(c) for c in row]), b))
+                cells = row.translate(self.cell_chars).decode('ascii')
+                lines.append('|{} {} {}|'.format(b, " ".join(cells), b))
             if self.has_border:
                 lines.append(lines[1])
             lines.append(lines[0])
@@ -69,45 +103,97 @@ class CTiles:
                 if r_index >= len(self.data):
                     loss += slab.width
                     continue
+                line = self.data[r_index]
                 c_index = xpos
                 c_end = c_index + slab.width
                 c_index = max(c_index, 0)
-                collisions = sum(self.data[r_index][c_index:c_end])
-                if collisions > 0:
+                if line.find(1, c_index, c_end) != -1:
                     return None
-                overhang = slab.width - len(self.data[r_index][c_index:])
+                overhang = slab.width - max(len(line) - c_index, 0)
                 loss += overhang
             return loss
 
+        def integral(self):
+            """Return the summed-area table of the grid, one row and column
+               larger than the data, so any rectangle can be counted in O(1).
+               It is built once and kept until reserve(..) changes the grid.
+            """
+            if self.table is None:
+                table = [[0] * (len(self.data[0]) + 1 if self.data else 1)]
+                for line in self.data:
+                    table.append(list(map(add, table[-1], accumulate(line, initial=0))))
+                self.table = table
+            return self.table
+
         def search(self, slab):
             """Search for the nearest available place to position the Tile by
                scanning from left to right and top to bottom.
             """
+            key = (self.height, self.width, self.has_border,
+                   slab.height, slab.width, b''.join(self.data))
+            if key in self.placements:
+                best = self.placements[key]
+            else:
+                best = self.scan_(slab)
+                if len(self.placements) >= self.placements_limit:
+                    self.placements.clear()
+                self.placements[key] = best
+            if best is None:
+                return None
             border_offset = 1 if self.has_border else 0
-            positions = []
+            loss, row, col = best
+            return {'ypos': row + border_offset,
+                    'xpos': col + border_offset,
+                    'loss': loss}
+
+        def scan_(self, slab):
+            """The search(..) scan itself, returning (loss, row, col) or None."""
+            table = self.integral()
+            data_height = len(self.data)
+            data_width = len(table[0]) - 1
+            best = None
             for row in range(self.height):
-                for col in range(self.width):
-                    loss = self.inquire(row, col, slab)
-                    if loss is not None:
-                        positions.append({'ypos': row + border_offset,
-                                          'xpos': col + border_offset,
-                                          'loss': loss})
-                        if loss == 0:
-                            break
-                if len(positions) > 0 and positions[-1]['loss'] == 0:
-                    break
-            if len(positions) > 0:
-                return sorted(positions, key=lambda c: c['loss'])[0]
-            return None
+                r_end = min(row + slab.height, data_height)
+                upper, lower = table[row], table[r_end]
+                # rows hanging off the bottom count in full, the rest by
+                # however far they run past the right edge
+                rows_in = r_end - row
+                rows_out = (slab.height - rows_in) * slab.width
+                # a spot starting on a reserved cell can never be free, so
+                # only the columns of free cells are tried
+                line = self.data[row]
+                col = line.find(0, 0, self.width)
+                while col != -1:
+                    c_end = min(col + slab.width, data_width)
+                    if lower[c_end] - upper[c_end] - lower[col] + upper[col]:
+                        # every spot up to the last reserved cell in the way
+                        # overlaps that same cell, so resume just past it
+                        blocked = max(self.data[r_index].rfind(1, col, c_end)
+                                      for r_index in range(row, r_end))
+                        col = line.find(0, blocked + 1, self.width)
+                        continue
+                    loss = rows_in * (slab.width - (data_width - col)) + rows_out
+                    if best is None or loss < best[0]:
+                        best = (loss, row, col)
+                    if loss == 0:
+                        break
+                    col = line.find(0, col + 1, self.width)
+                if col != -1:
+                    break  # stopped on a perfect fit
+            return best
 
         def reserve(self, slab):
             """Reserve a spot on the grid for the Tile."""
-            for row in range(slab.ypos, slab.ypos + slab.height):
-                for col in range(slab.xpos, slab.xpos + slab.width):
-                    if row < len(self.data) and col < len(self.data[row]):
-                        if self.data[row][col] > 0:
-                            raise AssertionError(f'{row},{col} is already reserved')
-                        self.data[row][col] = 1
+            for row in range(slab.ypos, min(slab.ypos + slab.height, len(self.data))):
+                line = self.data[row]
+                c_end = min(slab.xpos + slab.width, len(line))
+                if slab.xpos >= c_end:
+                    continue
+                col = line.find(1, slab.xpos, c_end)
+                if col != -1:
+                    raise AssertionError(f'{row},{col} is already reserved')
+                line[slab.xpos:c_end] = b'\x01' * (c_end - slab.xpos)
+                self.table = None
 
     class Stylist:
         """The Stylist initializes the styling pairs in the curses environment
@@ -133,6 +219,8 @@ class CTiles:
                 'bl': 0x2570,
             },
         }
+        border_chr_for = {mode: {n: chr(c) for n, c in chars.items()}
+                          for mode, chars in border_char_for.items()}
         xlate_attr_for = {
             'NORMAL': curses.A_NORMAL,
             'STANDOUT': curses.A_STANDOUT,
@@ -161,156 +249,161 @@ class CTiles:
             'CYAN': curses.COLOR_CYAN,
             'WHITE': curses.COLOR_WHITE,
         }
-        x11_color_rgb = {
-            'ALICE_BLUE': [240, 247, 255],
-            'ANTIQUE_WHITE': [250, 235, 214],
-            'AQUA': [0, 255, 255],
-            'AQUAMARINE': [128, 255, 212],
-            'AZURE': [240, 255, 255],
-            'BEIGE': [245, 245, 219],
-            'BISQUE': [255, 227, 196],
-            'BLANCHED_ALMOND': [255, 235, 204],
-            'BLUE_VIOLET': [138, 43, 227],
-            'BROWN': [166, 41, 41],
-            'BURLYWOOD': [222, 184, 135],
-            'CADET_BLUE': [94, 158, 161],
-            'CHARTREUSE': [128, 255, 0],
-            'CHOCOLATE': [209, 105, 31],
-            'CORAL': [255, 128, 79],
-            'CORNFLOWER_BLUE': [99, 148, 237],
-            'CORNSILK': [255, 247, 219],
-            'CRIMSON': [219, 20, 61],
-            'DARK_BLUE': [0, 0, 140],
-            'DARK_CYAN': [0, 140, 140],
-            'DARK_GOLDENROD': [184, 135, 10],
-            'DARK_GRAY': [168, 168, 168],
-            'DARK_GREEN': [0, 99, 0],
-            'DARK_KHAKI': [189, 184, 107],
-            'DARK_MAGENTA': [140, 0, 140],
-            'DARK_OLIVE_GREEN': [84, 107, 46],
-            'DARK_ORANGE': [255, 140, 0],
-            'DARK_ORCHID': [153, 51, 204],
-            'DARK_RED': [140, 0, 0],
-            'DARK_SALMON': [232, 150, 122],
-            'DARK_SEA_GREEN': [143, 189, 143],
-            'DARK_SLATE_BLUE': [71, 61, 140],
-            'DARK_SLATE_GRAY': [46, 79, 79],
-            'DARK_TURQUOISE': [0, 207, 209],
-            'DARK_VIOLET': [148, 0, 212],
-            'DEEP_PINK': [255, 20, 148],
-            'DEEP_SKY_BLUE': [0, 191, 255],
-            'DIM_GRAY': [105, 105, 105],
-            'DODGER_BLUE': [31, 143, 255],
-            'FIREBRICK': [178, 33, 33],
-            'FLORAL_WHITE': [255, 250, 240],
-            'FOREST_GREEN': [33, 140, 33],
-            'FUCHSIA': [255, 0, 255],
-            'GAINSBORO*': [219, 219, 219],
-            'GHOST_WHITE': [247, 247, 255],
-            'GOLD': [255, 214, 0],
-            'GOLDENROD': [217, 166, 33],
-            'GRAY': [191, 191, 191],
-            'WEB_GRAY': [128, 128, 128],
-            'WEB_GREEN': [0, 128, 0],
-            'GREEN_YELLOW': [173, 255, 46],
-            'HONEYDEW': [240, 255, 240],
-            'HOT_PINK': [255, 105, 181],
-            'INDIAN_RED': [204, 92, 92],
-            'INDIGO': [74, 0, 130],
-            'IVORY': [255, 255, 240],
-            'KHAKI': [240, 230, 140],
-            'LAVENDER': [230, 230, 250],
-            'LAVENDER_BLUSH': [255, 240, 245],
-            'LAWN_GREEN': [125, 252, 0],
-            'LEMON_CHIFFON': [255, 250, 204],
-            'LIGHT_BLUE': [173, 217, 230],
-            'LIGHT_CORAL': [240, 128, 128],
-            'LIGHT_CYAN': [224, 255, 255],
-            'LIGHT_GOLDENROD': [250, 250, 209],
-            'LIGHT_GRAY': [212, 212, 212],
-            'LIGHT_GREEN': [143, 237, 143],
-            'LIGHT_PINK': [255, 181, 194],
-            'LIGHT_SALMON': [255, 161, 122],
-            'LIGHT_SEA_GREEN': [33, 178, 171],
-            'LIGHT_SKY_BLUE': [135, 207, 250],
-            'LIGHT_SLATE_GRAY': [120, 135, 153],
-            'LIGHT_STEEL_BLUE': [176, 196, 222],
-            'LIGHT_YELLOW': [255, 255, 224],
-            'LIME': [0, 255, 0],
-            'LIME_GREEN': [51, 204, 51],
-            'LINEN': [250, 240, 230],
-            'MAROON': [176, 48, 97],
-            'WEB_MAROON': [128, 0, 0],
-            'MEDIUM_AQUAMARINE': [102, 204, 171],
-            'MEDIUM_BLUE': [0, 0, 204],
-            'MEDIUM_ORCHID': [186, 84, 212],
-            'MEDIUM_PURPLE': [148, 112, 219],
-            'MEDIUM_SEA_GREEN': [61, 178, 112],
-            'MEDIUM_SLATE_BLUE': [122, 105, 237],
-            'MEDIUM_SPRING_GREEN': [0, 250, 153],
-            'MEDIUM_TURQUOISE': [71, 209, 204],
-            'MEDIUM_VIOLET_RED': [199, 20, 133],
-            'MIDNIGHT_BLUE': [26, 26, 112],
-            'MINT_CREAM': [245, 255, 250],
-            'MISTY_ROSE': [255, 227, 224],
-            'MOCCASIN': [255, 227, 181],
-            'NAVAJO_WHITE': [255, 222, 173],
-            'NAVY_BLUE': [0, 0, 128],
-            'OLD_LACE': [252, 245, 230],
-            'OLIVE': [128, 128, 0],
-            'OLIVE_DRAB': [107, 143, 36],
-            'ORANGE': [255, 166, 0],
-            'ORANGE_RED': [255, 69, 0],
-            'ORCHID': [217, 112, 214],
-            'PALE_GOLDENROD': [237, 232, 171],
-            'PALE_GREEN': [153, 250, 153],
-            'PALE_TURQUOISE': [176, 237, 237],
-            'PALE_VIOLET_RED': [219, 112, 148],
-            'PAPAYA_WHIP': [255, 240, 214],
-            'PEACH_PUFF': [255, 217, 186],
-            'PERU': [204, 133, 64],
-            'PINK': [255, 191, 204],
-            'PLUM': [222, 161, 222],
-            'POWDER_BLUE': [176, 224, 230],
-            'PURPLE': [161, 33, 240],
-            'WEB_PURPLE': [128, 0, 128],
-            'REBECCA_PURPLE': [102, 51, 153],
-            'ROSY_BROWN': [189, 143, 143],
-            'ROYAL_BLUE': [64, 105, 224],
-            'SADDLE_BROWN': [140, 69, 18],
-            'SALMON': [250, 128, 115],
-            'SANDY_BROWN': [245, 163, 97],
-            'SEA_GREEN': [46, 140, 87],
-            'SEASHELL': [255, 245, 237],
-            'SIENNA': [161, 82, 46],
-            'SILVER': [191, 191, 191],
-            'SKY_BLUE': [135, 207, 235],
-            'SLATE_BLUE': [107, 89, 204],
-            'SLATE_GRAY': [112, 128, 143],
-            'SNOW': [255, 250, 250],
-            'SPRING_GREEN': [0, 255, 128],
-            'STEEL_BLUE': [69, 130, 181],
-            'TAN': [209, 181, 140],
-            'TEAL': [0, 128, 128],
-            'THISTLE': [217, 191, 217],
-            'TOMATO': [255, 99, 71],
-            'TURQUOISE': [64, 224, 209],
-            'VIOLET': [237, 130, 237],
-            'WHEAT': [245, 222, 178],
-            'WHITE_SMOKE': [245, 245, 245],
-            'YELLOW_GREEN': [153, 204, 51],
-        }
+        x11_colors = (
+            ('ALICE_BLUE', 240, 247, 255),
+            ('ANTIQUE_WHITE', 250, 235, 214),
+            ('AQUA', 0, 255, 255),
+            ('AQUAMARINE', 128, 255, 212),
+            ('AZURE', 240, 255, 255),
+            ('BEIGE', 245, 245, 219),
+            ('BISQUE', 255, 227, 196),
+            ('BLANCHED_ALMOND', 255, 235, 204),
+            ('BLUE_VIOLET', 138, 43, 227),
+            ('BROWN', 166, 41, 41),
+            ('BURLYWOOD', 222, 184, 135),
+            ('CADET_BLUE', 94, 158, 161),
+            ('CHARTREUSE', 128, 255, 0),
+            ('CHOCOLATE', 209, 105, 31),
+            ('CORAL', 255, 128, 79),
+            ('CORNFLOWER_BLUE', 99, 148, 237),
+            ('CORNSILK', 255, 247, 219),
+            ('CRIMSON', 219, 20, 61),
+            ('DARK_BLUE', 0, 0, 140),
+            ('DARK_CYAN', 0, 140, 140),
+            ('DARK_GOLDENROD', 184, 135, 10),
+            ('DARK_GRAY', 168, 168, 168),
+            ('DARK_GREEN', 0, 99, 0),
+            ('DARK_KHAKI', 189, 184, 107),
+            ('DARK_MAGENTA', 140, 0, 140),
+            ('DARK_OLIVE_GREEN', 84, 107, 46),
+            ('DARK_ORANGE', 255, 140, 0),
+            ('DARK_ORCHID', 153, 51, 204),
+            ('DARK_RED', 140, 0, 0),
+            ('DARK_SALMON', 232, 150, 122),
+            ('DARK_SEA_GREEN', 143, 189, 143),
+            ('DARK_SLATE_BLUE', 71, 61, 140),
+            ('DARK_SLATE_GRAY', 46, 79, 79),
+            ('DARK_TURQUOISE', 0, 207, 209),
+            ('DARK_VIOLET', 148, 0, 212),
+            ('DEEP_PINK', 255, 20, 148),
+            ('DEEP_SKY_BLUE', 0, 191, 255),
+            ('DIM_GRAY', 105, 105, 105),
+            ('DODGER_BLUE', 31, 143, 255),
+            ('FIREBRICK', 178, 33, 33),
+            ('FLORAL_WHITE', 255, 250, 240),
+            ('FOREST_GREEN', 33, 140, 33),
+            ('FUCHSIA', 255, 0, 255),
+            ('GAINSBORO*', 219, 219, 219),
+            ('GHOST_WHITE', 247, 247, 255),
+            ('GOLD', 255, 214, 0),
+            ('GOLDENROD', 217, 166, 33),
+            ('GRAY', 191, 191, 191),
+            ('WEB_GRAY', 128, 128, 128),
+            ('WEB_GREEN', 0, 128, 0),
+            ('GREEN_YELLOW', 173, 255, 46),
+            ('HONEYDEW', 240, 255, 240),
+            ('HOT_PINK', 255, 105, 181),
+            ('INDIAN_RED', 204, 92, 92),
+            ('INDIGO', 74, 0, 130),
+            ('IVORY', 255, 255, 240),
+            ('KHAKI', 240, 230, 140),
+            ('LAVENDER', 230, 230, 250),
+            ('LAVENDER_BLUSH', 255, 240, 245),
+            ('LAWN_GREEN', 125, 252, 0),
+            ('LEMON_CHIFFON', 255, 250, 204),
+            ('LIGHT_BLUE', 173, 217, 230),
+            ('LIGHT_CORAL', 240, 128, 128),
+            ('LIGHT_CYAN', 224, 255, 255),
+            ('LIGHT_GOLDENROD', 250, 250, 209),
+            ('LIGHT_GRAY', 212, 212, 212),
+            ('LIGHT_GREEN', 143, 237, 143),
+            ('LIGHT_PINK', 255, 181, 194),
+            ('LIGHT_SALMON', 255, 161, 122),
+            ('LIGHT_SEA_GREEN', 33, 178, 171),
+            ('LIGHT_SKY_BLUE', 135, 207, 250),
+            ('LIGHT_SLATE_GRAY', 120, 135, 153),
+            ('LIGHT_STEEL_BLUE', 176, 196, 222),
+            ('LIGHT_YELLOW', 255, 255, 224),
+            ('LIME', 0, 255, 0),
+            ('LIME_GREEN', 51, 204, 51),
+            ('LINEN', 250, 240, 230),
+            ('MAROON', 176, 48, 97),
+            ('WEB_MAROON', 128, 0, 0),
+            ('MEDIUM_AQUAMARINE', 102, 204, 171),
+            ('MEDIUM_BLUE', 0, 0, 204),
+            ('MEDIUM_ORCHID', 186, 84, 212),
+            ('MEDIUM_PURPLE', 148, 112, 219),
+            ('MEDIUM_SEA_GREEN', 61, 178, 112),
+            ('MEDIUM_SLATE_BLUE', 122, 105, 237),
+            ('MEDIUM_SPRING_GREEN', 0, 250, 153),
+            ('MEDIUM_TURQUOISE', 71, 209, 204),
+            ('MEDIUM_VIOLET_RED', 199, 20, 133),
+            ('MIDNIGHT_BLUE', 26, 26, 112),
+            ('MINT_CREAM', 245, 255, 250),
+            ('MISTY_ROSE', 255, 227, 224),
+            ('MOCCASIN', 255, 227, 181),
+            ('NAVAJO_WHITE', 255, 222, 173),
+            ('NAVY_BLUE', 0, 0, 128),
+            ('OLD_LACE', 252, 245, 230),
+            ('OLIVE', 128, 128, 0),
+            ('OLIVE_DRAB', 107, 143, 36),
+            ('ORANGE', 255, 166, 0),
+            ('ORANGE_RED', 255, 69, 0),
+            ('ORCHID', 217, 112, 214),
+            ('PALE_GOLDENROD', 237, 232, 171),
+            ('PALE_GREEN', 153, 250, 153),
+            ('PALE_TURQUOISE', 176, 237, 237),
+            ('PALE_VIOLET_RED', 219, 112, 148),
+            ('PAPAYA_WHIP', 255, 240, 214),
+            ('PEACH_PUFF', 255, 217, 186),
+            ('PERU', 204, 133, 64),
+            ('PINK', 255, 191, 204),
+            ('PLUM', 222, 161, 222),
+            ('POWDER_BLUE', 176, 224, 230),
+            ('PURPLE', 161, 33, 240),
+            ('WEB_PURPLE', 128, 0, 128),
+            ('REBECCA_PURPLE', 102, 51, 153),
+            ('ROSY_BROWN', 189, 143, 143),
+            ('ROYAL_BLUE', 64, 105, 224),
+            ('SADDLE_BROWN', 140, 69, 18),
+            ('SALMON', 250, 128, 115),
+            ('SANDY_BROWN', 245, 163, 97),
+            ('SEA_GREEN', 46, 140, 87),
+            ('SEASHELL', 255, 245, 237),
+            ('SIENNA', 161, 82, 46),
+            ('SILVER', 191, 191, 191),
+            ('SKY_BLUE', 135, 207, 235),
+            ('SLATE_BLUE', 107, 89, 204),
+            ('SLATE_GRAY', 112, 128, 143),
+            ('SNOW', 255, 250, 250),
+            ('SPRING_GREEN', 0, 255, 128),
+            ('STEEL_BLUE', 69, 130, 181),
+            ('TAN', 209, 181, 140),
+            ('TEAL', 0, 128, 128),
+            ('THISTLE', 217, 191, 217),
+            ('TOMATO', 255, 99, 71),
+            ('TURQUOISE', 64, 224, 209),
+            ('VIOLET', 237, 130, 237),
+            ('WHEAT', 245, 222, 178),
+            ('WHITE_SMOKE', 245, 245, 245),
+            ('YELLOW_GREEN', 153, 204, 51),
+        )
+        x11_color_names = frozenset(color[0] for color in x11_colors)
+        color_names = frozenset(xlate_color_for) | x11_color_names
+        # the X11 colors are numbered after the 8 basic and 8 bright colors
+        extended_color_base = 16
+        palette_ready = False
 
         def __init__(self, conf):
             self.database = {}
+            self.pair_cache = {}
+            self.pair_for = {}
+            self.style_cache = {}
             self.index = 1
             self.init_extended_colors()
             for key, style in conf.items():
                 if isinstance(style, list):
-                    colors, attr = self.translate(style)
-                    curses.init_pair(self.index, *colors)
-                    self.database[key] = curses.color_pair(self.index) | attr
-                    self.index += 1
+                    self.database[key] = self.style_(style)
 
         def merge(self, conf):
             """Merges provides color/attribute styling config with existing mappings.
@@ -319,10 +412,7 @@ class CTiles:
             merged = dict(self.database)
             for key, style in conf.items():
                 if isinstance(style, list):
-                    colors, attr = self.translate(style)
-                    curses.init_pair(self.index, *colors)
-                    merged[key] = curses.color_pair(self.index) | attr
-                    self.index += 1
+                    merged[key] = self.style_(style)
                 else:
                     merged[key] = conf[key]
             return merged
@@ -334,41 +424,88 @@ class CTiles:
             for key in action:
                 for trait in action[key]:
                     if isinstance(action[key][trait], list):
-                        colors, attr = self.translate(action[key][trait])
-                        curses.init_pair(self.index, *colors)
-                        action[key][trait] = curses.color_pair(self.index) | attr
-                        self.index += 1
+                        action[key][trait] = self.style_(action[key][trait])
             return action
 
+        def style_(self, tokens):
+            """Returns the addnstr(..) value for a color/attribute token list,
+               translating each distinct list of tokens only once.
+            """
+            key = tuple(tokens)
+            value = self.style_cache.get(key)
+            if value is None:
+                value = self.intern_(*self.translate(tokens))
+                self.style_cache[key] = value
+            return value
+
+        def intern_(self, colors, attr):
+            """Returns the addnstr(..) value for the given colors/attribute.
+               Attributes are ORed onto the color pair, so every attribute of
+               the same (fg, bg) combination shares one pair.
+            """
+            key = (colors[0], colors[1], attr)
+            value = self.pair_cache.get(key)
+            if value is None:
+                value = curses.color_pair(self.pair_index_(*colors)) | attr
+                self.pair_cache[key] = value
+            return value
+
+        def pair_index_(self, fg, bg):
+            """Returns the curses color pair for the given colors, allocating
+               it only the first time the (fg, bg) combination is seen.
+            """
+            pair = self.pair_for.get((fg, bg))
+            if pair is None:
+                if hasattr(curses, 'alloc_pair'):
+                    pair = curses.alloc_pair(fg, bg)
+                else:
+                    # curses bindings without alloc_pair(..) are numbered by hand
+                    pair = self.index
+                    curses.init_pair(pair, fg, bg)
+                    self.index += 1
+                self.pair_for[(fg, bg)] = pair
+            return pair
+
         def translate(self, tokens):
             """Translates a list of color/attribute str tokens into the equivilent
                ncurses color/attribute values. Unrecognized tokens are mapped to zero.
-               Returns two items: colors list, attribute
+               Returns two items: colors tuple, attribute
             """
-            colors = [0, 0]
-            attribute = 0
-            for i in range(2):
-                if i < len(tokens):
-                    colors[i] = self.xlate_color_for.get(tokens[i], 0)
-            if len(tokens) > 2:
-                attribute = self.xlate_attr_for.get(tokens[2], 0)
-            return colors, attribute
-
-        def init_extended_colors(self):
-            """Initialize extended (8+) colors with curses."""
-            ndex = 1 + max(self.xlate_color_for.values())
-            for color, rgb in self.x11_color_rgb.items():
+            color_for = self.xlate_color_for
+            count = len(tokens)
+            foreground = color_for.get(tokens[0], 0) if count > 0 else 0
+            background = color_for.get(tokens[1], 0) if count > 1 else 0
+            attribute = self.xlate_attr_for.get(tokens[2], 0) if count > 2 else 0
+            return (foreground, background), attribute
+
+        @classmethod
+        def init_extended_colors(cls):
+            """Initialize extended (16+) colors with curses once per process
+               so that later translate(..) calls are plain dict lookups.
+            """
+            if cls.palette_ready:
+                return
+            cls.palette_ready = True
+            if not curses.can_change_color():
+                return
+            ndex = cls.extended_color_base
+            for color, red, green, blue in cls.x11_colors:
+                if ndex >= curses.COLORS:
+                    break
                 try:
-                    curses.init_color(ndex, *rgb)
-                except:
+                    curses.init_color(ndex,
+                                      red * 1000 // 255,
+                                      green * 1000 // 255,
+                                      blue * 1000 // 255)
+                except curses.error:
                     continue
-                self.xlate_color_for[color] = ndex
+                cls.xlate_color_for[color] = ndex
                 ndex += 1
 
         @classmethod
         def is_color(cls, token):
             """Verifies that a given string token is a recognized ncurses color."""
-            return token in cls.xlate_color_for or token in cls.x11_color_rgb
+            return token in cls.color_names
 
         @classmethod
         def is_attr(cls, token):
@@ -378,40 +515,109 @@ class CTiles:
         @classmethod
         def border_chrs(cls, names, mode='single'):
             """Returns the box-art characters for either double or single."""
-            return {n: chr(cls.border_char_for[mode][n]) for n in names}
+            chars = cls.border_chr_for[mode]
+            return {n: chars[n] for n in names}
 
-    class Worker(Thread):
-        """The Worker threads will invoke the given generator function and load
-           the Queue with its results.
+    class Worker:
+        """The Worker invokes the given generator function and loads the Queue
+           with its results each time the Scheduler finds it due.
         """
         def __init__(self, queue, generator, frequency):
-            Thread.__init__(self)
-            self.daemon    = True
             self.queue     = queue
             self.generator = generator
             self.frequency = float(frequency)
-            self.stopped   = False
             self.paused    = False
 
+        def fire(self):
+            """Populate the Queue unless paused or the previous result
+               has not been consumed yet. Returns True if it was populated.
+            """
+            if not self.paused and len(self.queue) == 0:
+                self.queue.append(self.generator())
+                return True
+            return False
+
+        def toggle(self):
+            """Set the paused flag to cause fire to do nothing."""
+            self.paused = not self.paused
+
+    class Scheduler(Thread):
+        """The Scheduler thread fires all of the Workers from a single heap
+           of deadlines instead of dedicating a thread to each tile, and
+           writes the index of each refilled Queue to the wake pipe.
+           Paused Workers are parked off the heap until wake() is called.
+        """
+        # a Worker is never due again sooner than this, so a zero frequency
+        # (or a Queue that is still full) can't make the thread spin
+        min_period = 0.01
+
+        def __init__(self, workers, wake_fd):
+            Thread.__init__(self)
+            self.daemon  = True
+            self.stopped = False
+            self.wake_fd = wake_fd
+            self.wakeup  = Event()
+            self.parked  = []
+            # the index breaks deadline ties so Workers are never compared
+            self.heap    = [(0.0, ndex, worker) for ndex, worker in enumerate(workers)]
+
         def run(self):
-            """Text generator event loop populates the Queue."""
-            while not self.stopped:
-                if self.paused:
-                    time.sleep(1)
+            """Deadline event loop fires each Worker at its frequency."""
+            while not self.stopped and (self.heap or self.parked):
+                self.wakeup.clear()
+                if self.parked:
+                    self.unpark_()
+                if not self.heap:
+                    self.wakeup.wait()
+                    continue
+                deadline, ndex, worker = self.heap[0]
+                if worker.paused:
+                    self.parked.append(heapq.heappop(self.heap))
+                    continue
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    self.wakeup.wait(delay)
                     continue
-                if not self.queue.empty():
-                    self.queue.get()
-                self.queue.put(self.generator())
-                time.sleep(self.frequency)
-            self.queue.join()
+                try:
+                    fired = worker.fire()
+                except Exception:
+                    # a failing generator only retires its own Worker
+                    heapq.heappop(self.heap)
+                    continue
+                if fired:
+                    self.signal(ndex)
+                period = max(worker.frequency, self.min_period)
+                heapq.heapreplace(self.heap,
+                                  (time.monotonic() + period, ndex, worker))
+            os.close(self.wake_fd)
+
+        def unpark_(self):
+            """Return the resumed Workers to the heap, due immediately."""
+            now = time.monotonic()
+            parked = []
+            for entry in self.parked:
+                if entry[2].paused:
+                    parked.append(entry)
+                else:
+                    heapq.heappush(self.heap, (now, entry[1], entry[2]))
+            self.parked = parked
+
+        def wake(self):
+            """Interrupt the current wait, e.g. after a Worker was toggled."""
+            self.wakeup.set()
+
+        def signal(self, ndex):
+            """Notify the UI thread that the Queue at ndex has new lines."""
+            try:
+                os.write(self.wake_fd, struct.pack('=I', ndex))
+            except OSError:
+                # the UI thread has closed its end of the pipe
+                self.stopped = True
 
         def stop(self):
             """Set the stopped flag to cause the run loop to exit."""
             self.stopped = True
-
-        def toggle(self):
-            """Set the paused flag to cause the run loop to do nothing."""
-            self.paused = not self.paused
+            self.wakeup.set()
 
     class Tile:
         """The Tile represents a region on the terminal and maintains the
@@ -422,47 +628,56 @@ class CTiles:
             self.queue      = queue
             self.title      = kwargs['title']
             self.toggle_key = kwargs['toggle_key']
-            self.geometry   = kwargs['geometry']
             self.styles     = kwargs['styles']
             self.action     = kwargs['action']
             self.memory     = None
             self.loaded     = False
-            self.geometry['ypos'] = 0
-            self.geometry['xpos'] = 0
-            if self.has_border:
-                self.geometry['height'] += 2
-                self.geometry['width'] += 2
+            style_patterns = [p for p in self.styles if hasattr(p, 'search')]
+            # leading '^literal' patterns are resolved by the first character
+            self.style_prefixes = {}
+            while style_patterns:
+                prefix = self.literal_prefix_(style_patterns[0])
+                if prefix is None:
+                    break
+                markup = self.styles[style_patterns.pop(0)]
+                self.style_prefixes.setdefault(prefix[0], []).append((prefix, markup))
+            self.style_searchers = [(key.search, self.styles[key])
+                                    for key in style_patterns]
+            self.style_markups  = [self.styles[key] for key in style_patterns]
+            self.style_fused    = self.fuse_(style_patterns)
+            self.title_markup   = None
+            if self.title is not None and 'title' in self.styles:
+                self.title_markup = self.styles['title']
+            self.body_markup    = self.styles.get('body', 0)
+            # specialize markup_for when there are no pattern styles to search
+            if not self.style_searchers and not self.style_prefixes:
+                if self.title_markup is None and self.body_markup == 0:
+                    self.markup_for = self.markup_none_
+                else:
+                    self.markup_for = self.markup_static_
+            self.action_searchers = [(key.search, result)
+                                     for key, result in (self.action or {}).items()]
+            self.action_results = list((self.action or {}).values())
+            self.action_fused   = self.fuse_(list(self.action or {}))
+            self.has_border = self.styles['border']
+            # without a geometry the tile is sized to a slot by arrange(..)
+            self.auto_size  = kwargs['geometry'] is None
+            self.height     = 0 if self.auto_size else kwargs['geometry']['height']
+            self.width      = 0 if self.auto_size else kwargs['geometry']['width']
+            self.ypos       = 0
+            self.xpos       = 0
+            self.background = (None, None)
+            self.painted    = None  # (ypos, xpos, height, width) last drawn
+            self.rendered   = None  # (frame, {line_y: text}) on the screen now
+            if self.has_border and not self.auto_size:
+                self.height += 2
+                self.width  += 2
 
         def __str__(self):
             return f'({self.title})' \
                    f'[{self.ypos}+{self.height},' \
                    f'{self.xpos}+{self.width}]'
 
-        @property
-        def has_border(self):
-            """Boolean indicates border is on."""
-            return self.styles['border']
-
-        @property
-        def height(self):
-            """Provides the render height."""
-            return self.geometry['height']
-
-        @property
-        def width(self):
-            """Provides the render width."""
-            return self.geometry['width']
-
-        @property
-        def ypos(self):
-            """Provides the render ypos."""
-            return self.geometry['ypos']
-
-        @property
-        def xpos(self):
-            """Provides the render xpos."""
-            return self.geometry['xpos']
-
         @property
         def visible(self):
             """Boolean indicates that Tile is currently enabled."""
@@ -470,118 +685,223 @@ class CTiles:
 
         def position(self, ypos, xpos):
             """Position the Tile at the given y/x coordinates."""
-            if self.geometry['ypos'] != ypos or self.geometry['xpos'] != xpos:
-                self.geometry['ypos'] = ypos
-                self.geometry['xpos'] = xpos
+            self.ypos = ypos
+            self.xpos = xpos
 
         def markup_for(self, line_i, text):
             """Get the ncurses markup for the given text appearing on the
                given line number.
             """
-            if len(text.strip()) == 0:
+            if not text or text.isspace():
                 return 0
-            if line_i == 0 and \
-               self.title is not None and \
-               'title' in self.styles:
-                return self.styles['title']
-            keys = [p for p in self.styles if hasattr(p, 'search')]
-            for key in keys:
-                if re.search(key, text):
-                    return self.styles[key]
-            if 'body' in self.styles:
-                return self.styles['body']
+            if line_i == 0 and self.title_markup is not None:
+                return self.title_markup
+            if self.style_prefixes and text[0] in self.style_prefixes:
+                for prefix, markup in self.style_prefixes[text[0]]:
+                    if text.startswith(prefix):
+                        return markup
+            if self.style_fused is not None:
+                match = self.style_fused(text)
+                if match is None:
+                    return self.body_markup
+                return self.style_markups[match.lastindex - 1]
+            for search, markup in self.style_searchers:
+                if search(text):
+                    return markup
+            return self.body_markup
+
+        def markup_static_(self, line_i, text):
+            """The markup_for(..) specialization for a Tile without pattern styles."""
+            if not text or text.isspace():
+                return 0
+            if line_i == 0 and self.title_markup is not None:
+                return self.title_markup
+            return self.body_markup
+
+        @staticmethod
+        def markup_none_(line_i, text):
+            """The markup_for(..) specialization for an unstyled Tile."""
             return 0
 
-        def load(self):
-            """Load new lines from the queue."""
-            if self.memory is not None:
+        @staticmethod
+        def literal_prefix_(pattern):
+            """Return the text a '^literal' pattern requires a line to start
+               with, or None if the pattern is anything more than that.
+            """
+            source = pattern.pattern
+            if not isinstance(source, str) or not source.startswith('^') or \
+               pattern.flags & (re.IGNORECASE | re.VERBOSE):
+                return None
+            chars, ndex = [], 1
+            while ndex < len(source):
+                char = source[ndex]
+                if char == '\\':
+                    char = source[ndex + 1:ndex + 2]
+                    if not char or char.isalnum() or char == '_':
+                        return None  # \d, \b, backreferences, ...
+                    ndex += 1
+                elif char in '.^$*+?{}[]|()':
+                    return None
+                chars.append(char)
+                ndex += 1
+            return ''.join(chars) or None
+
+        @staticmethod
+        def fuse_(patterns):
+            """Combine the patterns into one ordered alternation of lookaheads
+               so a single match() call on a line reports the first pattern
+               (as match.lastindex) that the line would satisfy.
+               Returns the match method or None if the patterns can't be fused.
+            """
+            if len(patterns) < 2:
                 return None
-            lines = []
+            flags = patterns[0].flags
+            for pattern in patterns:
+                if pattern.groups or pattern.flags != flags or \
+                   flags & re.VERBOSE or not isinstance(pattern.pattern, str):
+                    return None
+            source = '|'.join(f'(?=[\\s\\S]*?({p.pattern}))' for p in patterns)
             try:
-                lines = self.queue.get_nowait()
-            except EmptyQueue:
+                fused = re.compile(source, flags)
+            except re.error:
                 return None
+            return fused.match if fused.groups == len(patterns) else None
+
+        def load(self):
+            """Load new lines from the queue.
+               Returns two items: changed flag, triggered action (or None)
+            """
+            # the Worker only appends to an empty deque and this is the only
+            # consumer, so a non-empty deque can be popped without a guard
+            if self.memory is not None or not self.queue:
+                return False, None
+            lines = self.queue.popleft()
             self.loaded = True
-            if len(lines) > 0:
-                self.lines = []
-                if self.title is not None:
-                    self.lines.append(self.title)
-                self.lines.extend(lines)
-            if self.action is not None:
-                for key, result in self.action.items():
-                    if any(re.search(key, line) for line in self.lines):
-                        return result
-            return None
-
-        def toggle(self, terminal):
-            """Toggles the hidden/inactive state."""
+            changed = len(lines) > 0
+            if changed:
+                fresh = [] if self.title is None else [self.title]
+                fresh.extend(lines)
+                # identical output leaves the painted tile as it is
+                changed = fresh != self.lines
+                self.lines = fresh
+            # a tile that isn't on the screen yet (e.g. its first output was
+            # empty) still needs its box drawn
+            if self.painted is None:
+                changed = True
+            if self.action_fused is not None:
+                first = None
+                for line in self.lines:
+                    match = self.action_fused(line)
+                    if match is not None and (first is None or match.lastindex < first):
+                        first = match.lastindex
+                        if first == 1:
+                            break
+                if first is None:
+                    return changed, None
+                return changed, self.action_results[first - 1]
+            for search, result in self.action_searchers:
+                if any(map(search, self.lines)):
+                    return changed, result
+            return changed, None
+
+        def toggle(self):
+            """Toggles the hidden/inactive state. The screen is brought up to
+               date by the arrange(..) that follows.
+            """
             if self.loaded:
                 if self.memory is None:
                     self.memory = self.lines
-                    self.lines = [' '] * self.geometry['height']
+                    self.lines = [' '] * self.height
                 else:
                     self.lines = self.memory
                     self.memory = None
                     self.load()
-                self.update(terminal)
 
-        def draw_background(self, terminal, min_y, max_y, min_x, max_x_length):
-            """Update the text on the ncurses terminal painting the background for this tile."""
+        def background_lines_(self, max_x_length):
+            """The background strings for the given width, kept until the
+               width changes (in practice, until the terminal is resized).
+            """
+            if self.background[0] == max_x_length:
+                return self.background[1]
             if self.has_border:
-                char = CTiles.Stylist.border_chrs(['tl','horz','vert','tr','rtee','br','bl','ltee'])
+                char = CTiles.Stylist.border_chr_for['single']
                 horizontal = char["horz"] * (max_x_length - 2)
                 blank = " " * (max_x_length - 2)
-                first_line = f'{char["tl"]}{horizontal}{char["tr"]}'
-                title_line = f'{char["ltee"]}{horizontal}{char["rtee"]}'
-                middle_line = f'{char["vert"]}{blank}{char["vert"]}'
-                last_line = f'{char["bl"]}{horizontal}{char["br"]}'
+                lines = (f'{char["tl"]}{horizontal}{char["tr"]}',
+                         f'{char["ltee"]}{horizontal}{char["rtee"]}',
+                         f'{char["vert"]}{blank}{char["vert"]}',
+                         f'{char["bl"]}{horizontal}{char["br"]}')
+            else:
+                lines = (" " * max_x_length,)
+            self.background = (max_x_length, lines)
+            return lines
+
+        def draw_background(self, terminal, min_y, max_y, min_x, max_x_length):
+            """Update the text on the ncurses terminal painting the background for this tile."""
+            if self.has_border:
+                first_line, title_line, middle_line, last_line = \
+                    self.background_lines_(max_x_length)
                 try:
                     terminal.addnstr(
                         min_y,
-                        self.geometry['xpos'],
+                        self.xpos,
                         first_line,
                         max_x_length)
                     for line_i, line_y in enumerate(range(min_y + 1, max_y)):
                         line = title_line if line_i == 1 else middle_line
                         terminal.addnstr(
                             line_y,
-                            self.geometry['xpos'],
+                            self.xpos,
                             line,
                             max_x_length)
                     terminal.addnstr(
                         max_y,
-                        self.geometry['xpos'],
+                        self.xpos,
                         last_line,
                         max_x_length)
-                except:
+                except curses.error:
                     return False
             else:
-                blank_line = " " * max_x_length
+                blank_line, = self.background_lines_(max_x_length)
                 try:
                     for line_y in range(min_y, max_y + 1):
                         terminal.addnstr(
                             line_y,
-                            self.geometry['xpos'],
+                            self.xpos,
                             blank_line,
                             max_x_length)
-                except:
+                except curses.error:
                     return False
             return True
 
-        def update(self, terminal):
-            """Update the text on the ncurses terminal with the stored line data."""
-            absolute_max_y, absolute_max_x = terminal.getmaxyx()
-            absolute_max_y -= 3  # status bar
-            absolute_max_x -= 1  # border
+        def update(self, terminal, screen_height, screen_width):
+            """Update the text on the ncurses terminal with the stored line data.
+               The screen dimensions are provided by the caller, which only
+               queries them when the terminal is resized.
+            """
+            absolute_max_y = screen_height - 3  # status bar
+            absolute_max_x = screen_width - 1   # border
 
-            min_y, min_x = self.geometry['ypos'], self.geometry['xpos']
+            self.painted = (self.ypos, self.xpos, self.height, self.width)
+            min_y, min_x = self.ypos, self.xpos
 
-            max_y = min(self.geometry['ypos'] + self.geometry['height'] - 1, absolute_max_y)
-            max_x_length = min(self.geometry['width'], absolute_max_x - self.geometry['xpos'])
+            max_y = min(self.ypos + self.height - 1, absolute_max_y)
+            max_x_length = min(self.width, absolute_max_x - self.xpos)
 
-            if not self.draw_background(terminal, min_y, max_y, min_x, max_x_length):
+            # a tile pushed off the screen by a resize has nothing to draw
+            if min_y > max_y or max_x_length <= 0:
                 return
 
+            # while the tile sits in the same frame, its background and any
+            # line that reads the same as last time are still on the screen
+            frame = (min_y, min_x, max_y, max_x_length)
+            if self.rendered is None or self.rendered[0] != frame:
+                self.rendered = None
+                if not self.draw_background(terminal, min_y, max_y, min_x, max_x_length):
+                    return
+                self.rendered = (frame, {})
+            shown = self.rendered[1]
+
             line_i_offset = 0
             if self.has_border:
                 min_y, min_x = min_y + 1, min_x + 1
@@ -595,6 +915,8 @@ class CTiles:
             if min_y > max_y:
                 return
 
+            # only switch the window attributes when the markup changes
+            prev_markup = None
             for line_i, line_y in enumerate(range(min_y, max_y + 1)):
                 line = ' '
                 if line_i == 1 and self.title is not None and self.has_border:
@@ -602,25 +924,26 @@ class CTiles:
                     continue
                 line_i += line_i_offset
                 if line_i < len(self.lines):
-                    line = re.sub(r'\s', " ", self.lines[line_i])
-                line += ' ' * (max_x_length - len(line))
+                    line = self.lines[line_i].translate(_WS_TABLE)
+                line = line[:max_x_length].ljust(max_x_length)
                 if line_i == 0 and \
                    self.memory is None and \
                    self.title is not None and \
                    self.toggle_key is not None and \
                    len(line) >= 3 + len(self.title):
                     line = line[0:-3] + f'[{self.toggle_key}]'
-                args = [
-                    line_y,
-                    min_x,
-                    line[0:max_x_length],
-                    max_x_length,
-                    self.markup_for(line_i, line)
-                ]
+                if shown.get(line_y) == line:
+                    continue
+                shown[line_y] = line
+                markup = self.markup_for(line_i, line)
+                if markup != prev_markup:
+                    terminal.attrset(markup)
+                    prev_markup = markup
                 try:
-                    terminal.addnstr(*args)
-                except:
-                    pass
+                    terminal.addnstr(line_y, min_x, line, max_x_length)
+                except curses.error:
+                    del shown[line_y]
+            terminal.attrset(0)
 
     def __init__(self, config):
         if not self.is_valid_(config):
@@ -629,6 +952,11 @@ class CTiles:
         self.tiles = config['tiles']
         self.current_height = 0
         self.current_width = 0
+        self.background = (None, None)
+        # key code -> index of the tile it shows and hides
+        self.togglers = {ord(tile['toggle']['key']): ndex
+                         for ndex, tile in enumerate(self.tiles)
+                         if tile['toggle']['key'] is not None}
 
     def screen_size_changed(self, terminal):
         """Determine if the terminal screen size has changed."""
@@ -647,7 +975,9 @@ class CTiles:
             print('toggle is not a dict', file=sys.stderr)
             return False
         result = True
-        if 'key' in toggle and toggle['key'] is not None:
+        if 'key' not in toggle:
+            toggle['key'] = None
+        elif toggle['key'] is not None:
             if not isinstance(toggle['key'], str) or len(toggle['key']) != 1:
                 print("toggle 'key' is not a one character str", file=sys.stderr)
                 result = False
@@ -656,10 +986,9 @@ class CTiles:
         elif not isinstance(toggle['active'], bool):
             print("toggle 'active' is not a bool", file=sys.stderr)
             result = False
-        for field in toggle:
-            if field not in ['key', 'active']:
-                print(f'Invalid toggle field: {field}', file=sys.stderr)
-                result = False
+        for field in toggle.keys() - cls.TOGGLE_FIELDS:
+            print(f'Invalid toggle field: {field}', file=sys.stderr)
+            result = False
         return result
 
     @classmethod
@@ -668,32 +997,55 @@ class CTiles:
         result = True
         if 'border' not in style:
             style['border'] = False
-        for field in style:
-            if field not in ['background', 'border', 'title', 'body'] and \
-                not hasattr(field, 'search'):
+        named, patterns = cls.partition_style_(style)
+        for field in named:
+            if field not in cls.STYLE_FIELDS:
                 print(f'Invalid style property: {field}', file=sys.stderr)
                 result = False
             elif field == 'border':
                 if not isinstance(style[field], bool):
                     print(f'Style property {field} must be a bool', file=sys.stderr)
                     result = False
-            elif len(style[field]) < 2:
-                print(f'{field} must have at least 2 colors', file=sys.stderr)
+            elif not cls.valid_colors_(field, style[field]):
+                result = False
+        for field in patterns:
+            if not cls.valid_colors_(field, style[field]):
                 result = False
+        return result
+
+    @classmethod
+    def partition_style_(cls, style):
+        """Split the 'style' configuration keys by kind.
+           Returns two items: named fields list, re.Pattern fields list
+        """
+        named, patterns = [], []
+        for field in style:
+            if hasattr(field, 'search'):
+                patterns.append(field)
             else:
-                for ndex in range(2):
-                    color = style[field][ndex]
-                    if not cls.Stylist.is_color(color):
-                        print(f'Invalid color: {color}', file=sys.stderr)
-                        result = False
-                if len(style[field]) > 2:
-                    attr = style[field][2]
-                    if not cls.Stylist.is_attr(attr):
-                        print(f'Invalid attribute: {attr}', file=sys.stderr)
-                        result = False
-                if len(style[field]) > 3:
-                    print(f'Too many color/attr: {field}', file=sys.stderr)
-                    result = False
+                named.append(field)
+        return named, patterns
+
+    @classmethod
+    def valid_colors_(cls, field, tokens):
+        """Validate the color/attribute list of a 'style' field."""
+        if len(tokens) < 2:
+            print(f'{field} must have at least 2 colors', file=sys.stderr)
+            return False
+        result = True
+        for ndex in range(2):
+            color = tokens[ndex]
+            if not cls.Stylist.is_color(color):
+                print(f'Invalid color: {color}', file=sys.stderr)
+                result = False
+        if len(tokens) > 2:
+            attr = tokens[2]
+            if not cls.Stylist.is_attr(attr):
+                print(f'Invalid attribute: {attr}', file=sys.stderr)
+                result = False
+        if len(tokens) > 3:
+            print(f'Too many color/attr: {field}', file=sys.stderr)
+            result = False
         return result
 
     @classmethod
@@ -760,7 +1112,13 @@ class CTiles:
         return result
 
     def is_valid_(self, config):
-        """Examine the configuration to verify it is valid."""
+        """Examine the configuration to verify it is valid.
+           A configuration (or tile) that passed is marked '_validated' with
+           its fingerprint, so validating it again is a no-op until it is
+           edited.
+        """
+        if config.get('_validated') == self.fingerprint_(config):
+            return True
         if 'style' not in config:
             config['style'] = {}
         elif not isinstance(config['style'], dict):
@@ -777,27 +1135,28 @@ class CTiles:
                 print(f'tile {ndex} is not a dict', file=sys.stderr)
                 result = False
                 continue
-            if 'title' not in tile:
-                config['tiles'][ndex]['title'] = None
-                tile = config['tiles'][ndex]
-            if 'toggle' not in tile:
-                config['tiles'][ndex]['toggle'] = {'key': None, 'active': True}
-                tile = config['tiles'][ndex]
-            if 'frequency' not in tile:
-                config['tiles'][ndex]['frequency'] = 1.0
-                tile = config['tiles'][ndex]
-            if 'style' not in tile:
-                config['tiles'][ndex]['style'] = {}
-                tile = config['tiles'][ndex]
-            if 'action' not in tile:
-                config['tiles'][ndex]['action'] = {}
-                tile = config['tiles'][ndex]
+            if tile.get('_validated') == self.fingerprint_(tile):
+                continue
+            for field, default in self.TILE_DEFAULTS:
+                if field not in tile:
+                    tile[field] = default()
             if tile['title'] is not None and not isinstance(tile['title'], str):
                 print(f'tile {ndex} title is not a str', file=sys.stderr)
                 result = False
-            if not isinstance(tile['frequency'], float):
-                print(f'tile {ndex} frequency is not a float', file=sys.stderr)
+            if isinstance(tile['frequency'], bool) or \
+               not isinstance(tile['frequency'], (int, float)):
+                print(f'tile {ndex} frequency is not a number', file=sys.stderr)
                 result = False
+            else:
+                try:
+                    frequency = float(tile['frequency'])
+                except OverflowError:
+                    frequency = math.inf  # an int too large for a float
+                if not math.isfinite(frequency) or frequency <= 0:
+                    print(f'tile {ndex} frequency must be a positive number', file=sys.stderr)
+                    result = False
+                else:
+                    tile['frequency'] = frequency
             if not self.valid_toggle_(tile['toggle']):
                 print(f'tile {ndex} has invalid toggle', file=sys.stderr)
                 result = False
@@ -808,30 +1167,100 @@ class CTiles:
                 print(f'tile {ndex} has invalid action', file=sys.stderr)
                 result = False
 
-            for field in tile:
-                if field not in ['title', 'toggle', 'frequency',
-                                 'style', 'generator', 'geometry', 'action']:
+            unknown = tile.keys() - self.TILE_FIELDS
+            if unknown:
+                for field in [f for f in tile if f in unknown]:
                     print(f'Invalid tile {ndex} field: {field}', file=sys.stderr)
-                    result = False
+                result = False
+        if result:
+            self.decapture_keys_(config['style'])
+            for tile in config['tiles']:
+                self.decapture_keys_(tile['style'])
+                self.decapture_keys_(tile['action'])
+                tile['_validated'] = self.fingerprint_(tile)
+            config['_validated'] = self.fingerprint_(config)
         return result
 
-    def draw_background(self, terminal):
-        height, width = terminal.getmaxyx()
+    @classmethod
+    def fingerprint_(cls, mapping):
+        """Digest of a configuration mapping (less its '_validated' mark)."""
+        return hash(repr([item for item in mapping.items() if item[0] != '_validated']))
+
+    @classmethod
+    def decapture_(cls, pattern):
+        """Recompile a re.Pattern with its capturing groups made non-capturing,
+           since tiles only ever search and never read match groups.
+           Patterns using backreferences or named groups are returned as is.
+        """
+        if pattern.groups == 0 or pattern.groupindex or \
+           not isinstance(pattern.pattern, str):
+            return pattern
+        source, chars, ndex = pattern.pattern, [], 0
+        in_class, class_start = False, False
+        while ndex < len(source):
+            char = source[ndex]
+            if char == '\\':
+                if source[ndex + 1:ndex + 2].isdigit():
+                    return pattern  # backreference
+                chars.append(source[ndex:ndex + 2])
+                ndex += 2
+                class_start = False
+                continue
+            if in_class:
+                if char == ']' and not class_start:
+                    in_class = False
+                class_start = class_start and char == '^' and chars[-1] == '['
+            elif char == '[':
+                in_class, class_start = True, True
+            elif char == '(' and source[ndex + 1:ndex + 2] != '?':
+                char = '(?:'
+            chars.append(char)
+            ndex += 1
+        try:
+            rewritten = re.compile(''.join(chars), pattern.flags)
+        except re.error:
+            return pattern
+        return rewritten if rewritten.groups == 0 else pattern
+
+    @classmethod
+    def decapture_keys_(cls, mapping):
+        """Replace the re.Pattern keys of the mapping in place with their
+           decaptured equivalents, preserving the key order.
+        """
+        if not any(hasattr(key, 'search') and key.groups for key in mapping):
+            return
+        items = [(cls.decapture_(key) if hasattr(key, 'search') else key, value)
+                 for key, value in mapping.items()]
+        mapping.clear()
+        mapping.update(items)
+
+    def background_lines_(self, width):
+        """The bordered screen background strings for the given width,
+           kept until the terminal is resized.
+        """
+        if self.background[0] == width:
+            return self.background[1]
+        char = CTiles.Stylist.border_chr_for['double']
+        lines = (char['tl'] + (char['horz'] * (width - 2)) + char['tr'],
+                 char['vert'] + (" " * (width - 2)) + char['vert'],
+                 char['bl'] + (char['horz'] * (width - 2)) + char['br'],
+                 " " * (width - 1))
+        self.background = (width, lines)
+        return lines
+
+    def draw_background(self, terminal, height, width):
+        """Paint the screen background for the given terminal size."""
         if self.style['border']:
-            char = CTiles.Stylist.border_chrs(['horz','vert', 'tl','tr','br','bl'], 'double')
-            first_line = char['tl'] + (char['horz'] * (width - 2)) + char['tr']
-            middle_line = char['vert'] + (" " * (width - 2)) + char['vert']
-            last_line = char['bl'] + (char['horz'] * (width - 2)) + char['br']
+            first_line, middle_line, last_line, status_line = \
+                self.background_lines_(width)
             terminal.addnstr(0, 0, first_line, len(first_line))
             for line_y in range(1, height - 2):
                 terminal.addnstr(line_y, 0, middle_line, width)
             terminal.addnstr(height - 2, 0, last_line, len(last_line))
-            terminal.addnstr(height - 1, 0, " " * (width - 1), width - 1)
+            terminal.addnstr(height - 1, 0, status_line, width - 1)
         else:
-            blank_line = " " * width
-            for line_y in range(height - 1):
-                terminal.addnstr(line_y, 0, blank_line, width)
-            terminal.addnstr(height - 1, 0, blank_line, width - 1)
+            # one C call blanks the whole window to its background
+            terminal.erase()
 
     def set_status(self, terminal, status):
         height, width = terminal.getmaxyx()
@@ -844,30 +1273,101 @@ class CTiles:
         message += ' ' * (width - len(message))
         terminal.addnstr(height - 1, 0, message, width - 1)
 
-    def arrange(self, terminal, slabs):
+    def auto_slots_(self, count, height, width):
+        """Split the tile area of the screen into count equal slots, in rows
+           of 1, 2, 3 or 4 columns depending on the count.
+           Returns a list of (ypos, xpos, height, width) tuples.
+        """
+        offset = 1 if self.style['border'] else 0
+        area_height = height - 2 - offset  # status bar
+        area_width = width - 1 - offset
+        cols = 1 if count == 1 else 2 if count <= 4 else 3 if count <= 9 else 4
+        rows = -(-count // cols)
+        slot_height, slot_width = max(area_height // rows, 0), max(area_width // cols, 0)
+        return [(offset + (n // cols) * slot_height,
+                 offset + (n % cols) * slot_width,
+                 slot_height,
+                 slot_width) for n in range(count)]
+
+    def blank_(self, terminal, rect, height, width):
+        """Paint the screen background over a (ypos, xpos, height, width)
+           rectangle, clipped to the tile area of the screen.
+        """
+        ypos, xpos, rect_height, rect_width = rect
+        length = min(xpos + rect_width, width - 1) - xpos
+        if length <= 0:
+            return
+        blank = ' ' * length
+        for line_y in range(ypos, min(ypos + rect_height, height - 2)):
+            terminal.addnstr(line_y, xpos, blank, length)
+
+    @staticmethod
+    def overlaps_(rect, other):
+        """Whether two (ypos, xpos, height, width) rectangles intersect."""
+        return rect[0] < other[0] + other[2] and other[0] < rect[0] + rect[2] and \
+               rect[1] < other[1] + other[3] and other[1] < rect[1] + rect[3]
+
+    def arrange(self, terminal, slabs, height, width, repaint=True):
         """Update the xpos/ypos attributes of the Tiles
-           to arrange them on the screen.
+           to arrange them on a screen of the given size.
+           Unless repaint is set (the background was just redrawn), only
+           the tiles that moved, or that sat under a tile that moved away,
+           are drawn again.
         """
-        height, width = terminal.getmaxyx()
         grid = self.Grid(height, width, self.style['border'])
-        for slab in [p for p in slabs if p.visible]:
-            slab.toggle(terminal)
+        placed = []
+        visible = [p for p in slabs if p.visible]
+        # tiles without a geometry share a rectangular split of the screen,
+        # searching for a spot only when theirs overlaps a fixed tile
+        auto = [p for p in visible if p.auto_size]
+        pending = [(p, None) for p in visible if not p.auto_size]
+        if auto:
+            pending.extend(zip(auto, self.auto_slots_(len(auto), height, width)))
+        for slab, slot in pending:
+            if slot is not None:
+                ypos, xpos, slab.height, slab.width = slot
+                if grid.inquire(ypos, xpos, slab) is not None:
+                    slab.position(ypos, xpos)
+                    grid.reserve(slab)
+                    placed.append(slab)
+                    continue
             location = grid.search(slab)
             if location is None:
+                slab.toggle()
                 continue
             slab.position(location['ypos'], location['xpos'])
-            slab.toggle(terminal)
             grid.reserve(slab)
+            placed.append(slab)
+        # paint only once everything is placed, so that no tile is blanked
+        # out by another one leaving the spot it has just moved into
+        rect_for = {slab: (slab.ypos, slab.xpos, slab.height, slab.width)
+                    for slab in placed}
+        stale = []
+        if not repaint:
+            stale = [slab.painted for slab in slabs if slab.painted is not None and
+                     slab.painted != rect_for.get(slab)]
+            for rect in stale:
+                self.blank_(terminal, rect, height, width)
+        for slab in slabs:
+            if slab not in rect_for:
+                slab.painted, slab.rendered = None, None
+        for slab, rect in rect_for.items():
+            if slab.loaded and (repaint or slab.painted != rect or
+                                any(self.overlaps_(rect, other) for other in stale)):
+                slab.rendered = None
+                slab.update(terminal, height, width)
 
     def __call__(self, terminal):
 
-        queues, workers, slabs, togglers = [], [], [], {}
+        queues, workers, slabs = [], [], []
 
         stylist = self.Stylist(self.style)
+        background = stylist.database.get('background')
 
         for tile in self.tiles:
 
-            queues.append(Queue(1))
+            # a one slot deque hands the latest lines over without locking
+            queues.append(deque(maxlen=1))
 
             workers.append(self.Worker(queues[-1],
                                        generator = tile['generator'],
@@ -880,34 +1380,50 @@ class CTiles:
                                    styles     = stylist.merge(tile['style']),
                                    action     = stylist.update(tile['action'])))
 
-            if tile['toggle']['key'] is not None:
-                togglers[ord(tile['toggle']['key'])] = len(slabs) - 1
-
-        for worker in workers:
-            worker.start()
+        wake_r, wake_w = os.pipe()
 
         curses.noecho()
         curses.cbreak()
         curses.curs_set(0)
+        # the cursor is hidden, so refresh need not move it back into place
+        terminal.leaveok(True)
         if curses.has_colors():
             curses.start_color()
-            if 'background' in stylist.database:
-                terminal.bkgd(stylist.database['background'])
+            if background is not None:
+                terminal.bkgd(background)
             else:
                 curses.use_default_colors()
 
         terminal.clear()
         terminal.nodelay(1)
-
-        running, paused = True, False
-        self.draw_background(terminal)
-        self.arrange(terminal, slabs)
+        # block on the keyboard and the wake pipe rather than spinning; the
+        # tick (capped at a second) bounds how late a resize is noticed;
+        # the 10ms floor keeps a zero frequency from spinning the loop
+        tick = max(0.01, min([1.0] + [tile['frequency'] for tile in self.tiles]))
+        selector = selectors.DefaultSelector()
+        selector.register(sys.stdin, selectors.EVENT_READ)
+        selector.register(wake_r, selectors.EVENT_READ)
+        pending = set()
+
+        running, paused, dirty, resized = True, False, True, False
+        self.screen_size_changed(terminal)
+        self.draw_background(terminal, self.current_height, self.current_width)
+        self.arrange(terminal, slabs, self.current_height, self.current_width)
+        # the generators only start once the screen is laid out
+        scheduler = self.Scheduler(workers, wake_w)
+        scheduler.start()
         try:
             while running:
                 if not paused:
-                    for slab in slabs:
-                        action = slab.load()
+                    changed_slabs = []
+                    for ndex in sorted(pending):
+                        pending.discard(ndex)
+                        slab = slabs[ndex]
+                        changed, action = slab.load()
+                        if changed:
+                            changed_slabs.append(slab)
                         if action is not None:
+                            dirty = True
                             if 'background' in action:
                                 terminal.bkgd(action['background'])
                             if 'status' in action:
@@ -920,38 +1436,70 @@ class CTiles:
                                 break
                     if not running:
                         break
-                    for slab in slabs:
-                        slab.update(terminal)
-                    if self.screen_size_changed(terminal):
-                        self.draw_background(terminal)
-                        self.arrange(terminal, slabs)
-                        terminal.bkgd(stylist.database['background'])
-                    terminal.refresh()
+                    # only the tiles with new lines need repainting
+                    for slab in changed_slabs:
+                        slab.update(terminal,
+                                    self.current_height,
+                                    self.current_width)
+                        dirty = True
+                    if resized and self.screen_size_changed(terminal):
+                        self.draw_background(terminal, self.current_height, self.current_width)
+                        self.arrange(terminal, slabs, self.current_height, self.current_width)
+                        if background is not None:
+                            terminal.bkgd(background)
+                        dirty = True
+                    resized = False
+                    if dirty:
+                        terminal.refresh()
+                        dirty = False
                 key_char = terminal.getch()
                 if key_char == -1:
+                    self.await_input_(selector, wake_r, pending, tick)
+                    continue
+                if key_char == curses.KEY_RESIZE:
+                    resized = True
                     continue
                 if key_char == self.Command.QUIT:
                     break
                 if key_char == self.Command.TOGGLE_HALT:
                     if paused:
-                        paused = False
-                        terminal.bkgd(stylist.database['background'])
+                        paused, dirty = False, True
+                        if background is not None:
+                            terminal.bkgd(background)
                     else:
                         paused = True
                     continue
                 if not paused:
-                    if key_char in togglers:
-                        ndex = togglers[key_char]
+                    if key_char in self.togglers:
+                        ndex = self.togglers[key_char]
                         workers[ndex].toggle()
-                        slabs[ndex].toggle(terminal)
-                        self.draw_background(terminal)
-                        self.arrange(terminal, slabs)
-                        terminal.bkgd(stylist.database['background'])
+                        scheduler.wake()
+                        slabs[ndex].toggle()
+                        self.arrange(terminal, slabs, self.current_height,
+                                     self.current_width, repaint=False)
+                        if background is not None:
+                            terminal.bkgd(background)
+                        dirty = True
         except KeyboardInterrupt:
             return
         finally:
-            for worker in workers:
-                worker.stop()
+            scheduler.stop()
+            selector.close()
+            os.close(wake_r)
+
+    @staticmethod
+    def await_input_(selector, wake_fd, pending, timeout):
+        """Block until a key is pressed, the Scheduler signals a refilled
+           Queue, or the timeout expires. Signalled tile indices are added
+           to the pending set.
+        """
+        for key, _ in selector.select(timeout):
+            if key.fd == wake_fd:
+                data = os.read(wake_fd, 4096)
+                if not data:
+                    # every Worker has retired and the Scheduler has exited
+                    selector.unregister(wake_fd)
+                pending.update(ndex for (ndex,) in struct.iter_unpack('=I', data))
 
     def run(self):
         """The run method simply invokes curses.wrapper."""
@@ -7,25 +7,41 @@ Data: Feb 22, 2023
 See: https://github.com/ddoxey/curtiles
 """
 import re
-import textwrap
 import datetime
 import subprocess
 from curtiles import CTiles
 
 StartTime = datetime.datetime.now()
 
-def shell_command(cmd_tokens):
+def shell_lines(cmd_tokens):
     proc = subprocess.run(cmd_tokens,
                     encoding='UTF-8',
                     stdout=subprocess.PIPE,
                     stderr=subprocess.STDOUT,
                     check=False)
-    result = {
-        'status': proc.returncode,
-        'stdout': proc.stdout,
-        'stderr': proc.stderr
-    }
-    return result
+    return proc.stdout.splitlines()
+
+def wrap(text, width):
+    """Greedy word wrap, breaking words longer than the width."""
+    lines, line, length = [], [], 0
+    for word in text.split():
+        if line and length + 1 + len(word) > width:
+            if len(word) > width and length + 1 < width:
+                # like textwrap, an over-long word starts on the current line
+                head = width - length - 1
+                line.append(word[:head])
+                word = word[head:]
+            lines.append(" ".join(line))
+            line, length = [], 0
+        while len(word) > width:
+            lines.append(word[:width])
+            word = word[width:]
+        if len(word) > 0:
+            length += len(word) + (1 if line else 0)
+            line.append(word)
+    if line:
+        lines.append(" ".join(line))
+    return lines
 
 def time_of_day():
     now = datetime.datetime.now()
@@ -37,36 +53,38 @@ def make_header():
 
 def make_calendar():
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    cal = shell_command(['cal'])
     lines = [f'{timestamp}']
-    lines.extend(cal['stdout'].split("\n"))
+    lines.extend(shell_lines(['cal']))
     return lines
 
+PlatformLines = None
+
 def make_platform():
-    uname = shell_command(['uname', '-s', '-r', '-m', '-p', '-i', '-o'])
-    return uname['stdout'].split(" ")
+    # the platform doesn't change while the demo runs, so uname runs once
+    global PlatformLines
+    if PlatformLines is None:
+        uname = shell_lines(['uname', '-s', '-r', '-m', '-p', '-i', '-o'])
+        PlatformLines = uname[0].split(" ") if uname else []
+    return PlatformLines
 
 
 def make_proc_list():
-    proc_table = shell_command(['ps', '-e'])
-    return proc_table['stdout'].split("\n")
+    return shell_lines(['ps', '-e'])
 
 
 def make_active_users():
-    who = shell_command(['who'])
-    return who['stdout'].split("\n")
+    return shell_lines(['who'])
 
 
 def make_fortune():
-    fort = shell_command(['fortune'])
-    lines = [l for l in fort['stdout'].split("\n") if len(l) > 0]
+    lines = [l for l in shell_lines(['fortune']) if len(l) > 0]
     signature = None
     if len(lines) > 1 and re.match(r'^\s+[-]', lines[-1]):
-        signature = textwrap.wrap(lines.pop(), width=55)
-        lines = textwrap.wrap(" ".join(lines), width=55)
+        signature = wrap(lines.pop(), width=55)
+        lines = wrap(" ".join(lines), width=55)
         lines.extend(signature)
     else:
-        lines = textwrap.wrap(" ".join(lines), width=55)
+        lines = wrap(" ".join(lines), width=55)
     return lines
 
 
@@ -0,0 +1,46 @@
+import io
+import unittest
+from contextlib import redirect_stderr
+
+from curtiles import CTiles
+
+
+class TestFrequency(unittest.TestCase):
+
+    def config(self, frequency):
+        return {'style': {},
+                'tiles': [{'generator': lambda: [], 'frequency': frequency}]}
+
+    def is_valid(self, config):
+        errors = io.StringIO()
+        with redirect_stderr(errors):
+            try:
+                CTiles(config)
+                valid = True
+            except AssertionError:
+                valid = False
+        return valid, errors.getvalue()
+
+    def test_positive_numbers_are_accepted(self):
+        for frequency in (1, 0.25, 60):
+            config = self.config(frequency)
+            valid, errors = self.is_valid(config)
+            self.assertTrue(valid, errors)
+            self.assertEqual(config['tiles'][0]['frequency'], float(frequency))
+            self.assertIsInstance(config['tiles'][0]['frequency'], float)
+
+    def test_non_positive_or_infinite_numbers_are_rejected(self):
+        for frequency in (0, 0.0, -1, float('nan'), float('inf'), 10 ** 400):
+            valid, errors = self.is_valid(self.config(frequency))
+            self.assertFalse(valid)
+            self.assertIn('tile 0 frequency must be a positive number', errors)
+
+    def test_non_numbers_are_rejected(self):
+        for frequency in ('1', True, None):
+            valid, errors = self.is_valid(self.config(frequency))
+            self.assertFalse(valid)
+            self.assertIn('tile 0 frequency is not a number', errors)
+
+
+if __name__ == '__main__':
+    unittest.main()
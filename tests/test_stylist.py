@@ -0,0 +1,44 @@
+import unittest
+from unittest import mock
+
+import curses
+from curtiles import CTiles
+
+
+class TestStylistPairs(unittest.TestCase):
+
+    def setUp(self):
+        # no terminal here, so the palette setup is skipped and the pair
+        # functions are replaced by a fake allocator
+        patches = [
+            mock.patch.object(CTiles.Stylist, 'palette_ready', True),
+            mock.patch.object(curses, 'alloc_pair', create=True,
+                              side_effect=lambda fg, bg: 10 + fg * 8 + bg),
+            mock.patch.object(curses, 'color_pair', side_effect=lambda pair: pair << 8),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_attributes_share_the_color_pair(self):
+        stylist = CTiles.Stylist({
+            'plain': ['WHITE', 'BLUE'],
+            'bold': ['WHITE', 'BLUE', 'BOLD'],
+            'underline': ['WHITE', 'BLUE', 'UNDERLINE'],
+            'other': ['RED', 'BLUE'],
+        })
+        self.assertEqual(curses.alloc_pair.call_count, 2)
+        plain = stylist.database['plain']
+        self.assertEqual(stylist.database['bold'], plain | curses.A_BOLD)
+        self.assertEqual(stylist.database['underline'], plain | curses.A_UNDERLINE)
+        self.assertNotEqual(stylist.database['other'], plain)
+
+    def test_merge_reuses_existing_pairs(self):
+        stylist = CTiles.Stylist({'title': ['WHITE', 'BLUE']})
+        merged = stylist.merge({'title': ['WHITE', 'BLUE', 'BOLD']})
+        self.assertEqual(curses.alloc_pair.call_count, 1)
+        self.assertEqual(merged['title'], stylist.database['title'] | curses.A_BOLD)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from collections import deque
+
+from curtiles import CTiles
+
+
+class Terminal:
+    """Stands in for the curses window, recording what is written."""
+    def __init__(self):
+        self.writes = []
+
+    def addnstr(self, ypos, xpos, text, length):
+        self.writes.append((ypos, xpos, text[:length]))
+
+    def attrset(self, attr):
+        pass
+
+
+class TestTileLoad(unittest.TestCase):
+
+    def make_tile(self, queue):
+        return CTiles.Tile(queue,
+                           title      = 'EMPTY',
+                           geometry   = {'height': 3, 'width': 10},
+                           toggle_key = None,
+                           styles     = {'border': True},
+                           action     = {})
+
+    def test_empty_first_output_is_drawn(self):
+        queue = deque(maxlen=1)
+        tile = self.make_tile(queue)
+        queue.append([])
+        changed, action = tile.load()
+        self.assertTrue(changed)
+        self.assertIsNone(action)
+        terminal = Terminal()
+        tile.update(terminal, 24, 80)
+        self.assertTrue(terminal.writes)
+        self.assertEqual(tile.painted, (0, 0, 5, 12))
+
+    def test_empty_output_after_paint_is_unchanged(self):
+        queue = deque(maxlen=1)
+        tile = self.make_tile(queue)
+        queue.append(['one'])
+        self.assertTrue(tile.load()[0])
+        tile.update(Terminal(), 24, 80)
+        queue.append([])
+        self.assertFalse(tile.load()[0])
+        self.assertEqual(tile.lines, ['EMPTY', 'one'])
+
+
+if __name__ == '__main__':
+    unittest.main()